@@ -29,18 +29,111 @@ Expected Lambda Event Structure:
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
-
-import boto3
-from botocore.exceptions import ClientError
-
-# Configure logging
-logger = logging.getLogger()
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+# Serialize with orjson when it is bundled with the function, otherwise fall
+# back to the standard library encoder
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string, stringifying unsupported types."""
+        try:
+            return orjson.dumps(obj, default=str).decode()
+        except TypeError:
+            # orjson rejects input the standard library accepts, such as lone
+            # surrogates and non-str dict keys; error bodies must still serialize
+            return json.dumps(obj, default=str)
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string, stringifying unsupported types."""
+        return json.dumps(obj, default=str)
+
+# boto3/botocore are the heaviest imports in the package; they are loaded on
+# first use by _lazy_imports() to keep them out of the import-time graph
+boto3 = None
+botocore = None
+
+# Configure logging on a module logger; records propagate to the handler Lambda
+# installs on the root logger, which is left untouched. INFO is set here because
+# the runtime leaves the root logger at WARNING, which would drop debug_log output.
+logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-qconnect_client = boto3.client('qconnect')
-connect_client = boto3.client('connect', region_name=os.environ.get('AWS_REGION', 'us-east-1'))
+# Region is invariant for the lifetime of the sandbox, so resolve it once
+_AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
+
+# Debug logging flag, resolved once so disabled debug_log calls return immediately
+_DEBUG_ENABLED = os.environ.get('DEBUG_LOG') == 'true'
+
+# Session ARNs resolved by describe_contact, keyed by (contact_id, instance_id)
+# and kept across warm invocations; CACHE_TTL_SECONDS=0 disables caching
+_DEFAULT_SESSION_ARN_CACHE_TTL = 300.0
+try:
+    _SESSION_ARN_CACHE_TTL = float(os.environ.get('CACHE_TTL_SECONDS', _DEFAULT_SESSION_ARN_CACHE_TTL))
+except ValueError:
+    # A malformed value must not fail Lambda INIT; fall back to the default
+    logger.warning(f"Invalid CACHE_TTL_SECONDS value; using the default of {_DEFAULT_SESSION_ARN_CACHE_TTL:g} seconds")
+    _SESSION_ARN_CACHE_TTL = _DEFAULT_SESSION_ARN_CACHE_TTL
+_SESSION_ARN_CACHE_MAX_SIZE = 512
+_SESSION_ARN_CACHE: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+
+def _lazy_imports() -> None:
+    """Import boto3 and the botocore submodules used by this module, once."""
+    global boto3, botocore
+    if boto3 is None:
+        import boto3
+        import botocore.config
+        import botocore.exceptions
+
+
+@lru_cache(maxsize=1)
+def _get_boto_config() -> Any:
+    """Return the client configuration shared by both AWS clients."""
+    _lazy_imports()
+    # Keep connections alive across warm invocations so
+    # describe_contact/update_session_data skip the TCP+TLS handshake. Connect's
+    # Invoke Lambda block waits at most 8 seconds, so each call gets a single
+    # attempt of at most 1 + 2.5 seconds: both calls together stay within 7
+    # seconds, and a retry would only land after Connect has given up
+    return botocore.config.Config(
+        tcp_keepalive=True,
+        max_pool_connections=50,
+        connect_timeout=1,
+        read_timeout=2.5,
+        retries={'total_max_attempts': 1, 'mode': 'standard'}
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_qconnect() -> Any:
+    """Return the Q Connect client, creating it once per sandbox."""
+    _lazy_imports()
+    client = boto3.client('qconnect', region_name=_AWS_REGION, config=_get_boto_config())
+    # Parse the operation model now rather than on the first real API call
+    client.meta.service_model.operation_model('UpdateSessionData')
+    return client
+
+
+@lru_cache(maxsize=1)
+def _get_connect() -> Any:
+    """Return the Amazon Connect client, creating it once per sandbox."""
+    _lazy_imports()
+    client = boto3.client('connect', region_name=_AWS_REGION, config=_get_boto_config())
+    # Parse the operation model now rather than on the first real API call
+    client.meta.service_model.operation_model('DescribeContact')
+    return client
+
+
+# Build both clients (and parse their operation models) during Lambda INIT,
+# which runs with boosted CPU, rather than on the first invocation. Skipped
+# outside Lambda so tests and tooling can import this module without AWS.
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    _get_qconnect()
+    _get_connect()
 
 
 class ContextKeys:
@@ -49,19 +142,52 @@ class ContextKeys:
     CONNECT_INSTANCE_ID = "CONNECT_INSTANCE_ID"
 
 
+class QicHandlerError(Exception):
+    """Base class for expected handler failures, identified by a stable error code."""
+    code = "QicHandlerError"
+
+
+class MissingParameterError(QicHandlerError):
+    """Required parameter not found in the Connect event or Lambda environment."""
+    code = "MissingParameter"
+
+
+class NoQConnectSessionError(QicHandlerError):
+    """Connect contact has no associated Q Connect session."""
+    code = "NoQConnectSession"
+
+
+# Skip system parameters used for Lambda configuration
+_SYSTEM_KEYS = frozenset((ContextKeys.AI_ASSISTANT_ID, ContextKeys.CONNECT_INSTANCE_ID))
+
+# Connect instance ID comes from the Lambda environment only, so resolve it
+# once; it is validated when an event arrives
+_CONNECT_INSTANCE_ID = os.environ.get(ContextKeys.CONNECT_INSTANCE_ID)
+
+# Response bodies, pre-serialized in the same format json.dumps would produce
+_NO_SESSION_DATA_BODY = '{"message": "No session data to update"}'
+_SUCCESS_BODY_TEMPLATE = '{"message": "Successfully updated %d session data entries"}'
+_ERROR_BODY_TEMPLATE = '{"error": %s}'
+_HANDLER_ERROR_BODY_TEMPLATE = '{"error": %s, "code": "%s"}'
+
+
 def debug_log(message: str, data: Any = None) -> None:
     """Debug logging function that only logs when DEBUG_LOG is true."""
-    if os.environ.get('DEBUG_LOG') == 'true':
-        log_entry = {"level": "DEBUG", "message": message}
-        if data is not None:
-            log_entry["params"] = data
-        logger.info(json.dumps(log_entry, default=str))
+    if not _DEBUG_ENABLED:
+        return
+    log_entry = {"level": "DEBUG", "message": message}
+    if data is not None:
+        log_entry["params"] = data
+    logger.info(_dumps(log_entry))
 
 
 def get_qic_session_arn(contact_id: str, connect_instance_id: str) -> str:
     """
     Get the Q Connect session ARN from Amazon Connect contact details.
 
+    Resolved ARNs are cached per contact for CACHE_TTL_SECONDS, so repeated
+    invocations for the same contact skip the describe_contact call.
+
     Args:
         contact_id: The Amazon Connect contact ID
         connect_instance_id: The Amazon Connect instance ID
@@ -70,15 +196,26 @@ def get_qic_session_arn(contact_id: str, connect_instance_id: str) -> str:
         The Q Connect session ARN
 
     Raises:
-        Exception: If no Q Connect session is found for the contact
+        NoQConnectSessionError: If no Q Connect session is found for the contact
     """
+    cache_key = (contact_id, connect_instance_id)
+    cached = _SESSION_ARN_CACHE.get(cache_key)
+    if cached is not None:
+        if cached[1] > time.monotonic():
+            debug_log("Using cached QiC session ARN", {"ContactId": contact_id})
+            return cached[0]
+        del _SESSION_ARN_CACHE[cache_key]
+
+    # Resolve botocore before the except clause below needs ClientError
+    _lazy_imports()
+
     try:
         debug_log("Get QiC session request", {
             "ContactId": contact_id,
             "InstanceId": connect_instance_id
         })
 
-        response = connect_client.describe_contact(
+        response = _get_connect().describe_contact(
             ContactId=contact_id,
             InstanceId=connect_instance_id
         )
@@ -86,14 +223,23 @@ def get_qic_session_arn(contact_id: str, connect_instance_id: str) -> str:
         debug_log("Get QiC session response", response)
 
         # Navigate through the response structure to find the session ARN
-        session_arn = response.get('Contact', {}).get('WisdomInfo', {}).get('SessionArn')
+        try:
+            session_arn = response['Contact']['WisdomInfo']['SessionArn']
+        except KeyError:
+            session_arn = None
 
         if not session_arn:
-            raise Exception(f"No Q Connect session found for contact {contact_id}.")
+            raise NoQConnectSessionError(f"No Q Connect session found for contact {contact_id}.")
+
+        if _SESSION_ARN_CACHE_TTL > 0:
+            if len(_SESSION_ARN_CACHE) >= _SESSION_ARN_CACHE_MAX_SIZE:
+                # Evict the oldest entry; dicts preserve insertion order
+                del _SESSION_ARN_CACHE[next(iter(_SESSION_ARN_CACHE))]
+            _SESSION_ARN_CACHE[cache_key] = (session_arn, time.monotonic() + _SESSION_ARN_CACHE_TTL)
 
         return session_arn
 
-    except ClientError as e:
+    except botocore.exceptions.ClientError as e:
         logger.error(f"AWS API error retrieving contact: {str(e)}")
         raise
     except Exception as e:
@@ -101,80 +247,70 @@ def get_qic_session_arn(contact_id: str, connect_instance_id: str) -> str:
         raise
 
 
-def get_parameter_from_event_or_env(context_key: str, connect_request: Dict[str, Any]) -> str:
+def get_parameter_from_event_or_env(context_key: str, parameters: Dict[str, Any]) -> str:
     """
     Get parameter from Connect event parameters or environment variables.
 
     Args:
         context_key: The parameter key to search for
-        connect_request: The Connect event request payload
+        parameters: The Connect event parameters (Details.Parameters)
 
     Returns:
         The parameter value
 
     Raises:
-        Exception: If the parameter is not found in either location
+        MissingParameterError: If the parameter is not found in either location
     """
     # First, try to get from Connect event parameters
-    value = connect_request.get('Details', {}).get('Parameters', {}).get(context_key)
-    
+    event_value = parameters.get(context_key)
+
     # If not found in event, try environment variables
-    if not value:
-        value = os.environ.get(context_key)
+    value = event_value or os.environ.get(context_key)
 
     if not value:
-        raise Exception(f"Required parameter '{context_key}' not found in Connect event parameters or Lambda environment variables.")
+        raise MissingParameterError(f"Required parameter '{context_key}' not found in Connect event parameters or Lambda environment variables.")
 
     debug_log(f"Retrieved parameter {context_key}", {
-        "source": "event" if connect_request.get('Details', {}).get('Parameters', {}).get(context_key) else "environment"
+        "source": "event" if event_value else "environment"
     })
 
     return value
 
 
-def get_session_data(connect_request: Dict[str, Any]) -> List[Dict[str, Any]]:
+def get_session_data(parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Convert Amazon Connect contact flow parameters to Q Connect session data format.
 
     Args:
-        connect_request: The Connect event request payload
+        parameters: The Connect event parameters (Details.Parameters)
 
     Returns:
         List of session data entries in Q Connect format
     """
-    parameters = connect_request.get('Details', {}).get('Parameters', {})
-
     if not parameters:
         debug_log("No parameters found in Connect event")
         return []
 
-    session_data = []
-
-    # Skip system parameters used for Lambda configuration
-    system_keys = {ContextKeys.AI_ASSISTANT_ID, ContextKeys.CONNECT_INSTANCE_ID}
-
-    for key, value in parameters.items():
-        if key not in system_keys:
-            # Convert value to string as required by Q Connect API
-            string_value = str(value) if value is not None else ''
-
-            session_data.append({
-                'key': key,
-                'value': {
-                    'stringValue': string_value
-                }
-            })
-
-            debug_log(f"Added parameter to session data: {key}", {
-                "key": key,
-                "valueLength": len(string_value)
-            })
-
-    debug_log(f"Converted {len(session_data)} parameters to session data format", {
-        "totalParameters": len(parameters),
-        "systemParameters": len(parameters) - len(session_data),
-        "sessionDataCount": len(session_data)
-    })
+    # Convert values to strings as required by Q Connect API; Connect contact
+    # flow parameters already arrive as strings, so str() is only a fallback
+    session_data = [
+        {
+            'key': key,
+            'value': {
+                'stringValue': value if type(value) is str else ('' if value is None else str(value))
+            }
+        }
+        for key, value in parameters.items()
+        if key not in _SYSTEM_KEYS
+    ]
+
+    if _DEBUG_ENABLED:
+        debug_log(f"Converted {len(session_data)} parameters to session data format", {
+            "keys": [entry['key'] for entry in session_data],
+            "totalParameters": len(parameters),
+            "systemParameters": len(parameters) - len(session_data),
+            "sessionDataCount": len(session_data)
+        })
 
     return session_data
 
@@ -191,6 +327,9 @@ def update_qic_session(ai_assistant_id: str, qic_session_arn: str, session_data:
     Raises:
         Exception: If the Q Connect API call fails
     """
+    # Resolve botocore before the except clause below needs ClientError
+    _lazy_imports()
+
     try:
         debug_log("Update QiC session request", {
             "assistantId": ai_assistant_id,
@@ -198,7 +337,7 @@ def update_qic_session(ai_assistant_id: str, qic_session_arn: str, session_data:
             "dataCount": len(session_data)
         })
 
-        response = qconnect_client.update_session_data(
+        response = _get_qconnect().update_session_data(
             assistantId=ai_assistant_id,
             sessionId=qic_session_arn,
             data=session_data
@@ -206,7 +345,7 @@ def update_qic_session(ai_assistant_id: str, qic_session_arn: str, session_data:
 
         debug_log("Update QiC session response", response)
 
-    except ClientError as e:
+    except botocore.exceptions.ClientError as e:
         logger.error(f"Q Connect API error: {str(e)}")
         raise
     except Exception as e:
@@ -226,33 +365,38 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         Lambda response with status code and message
     """
     try:
+        # Destructure the event once; later steps work on these locals
+        details = event.get('Details') or {}
+        contact_data = details.get('ContactData') or {}
+        parameters = details.get('Parameters') or {}
+
         # Extract contact ID
-        contact_id = event.get('Details', {}).get('ContactData', {}).get('ContactId')
-        
+        contact_id = contact_data.get('ContactId')
+
         if not contact_id:
-            raise Exception("ContactId not found in event")
+            raise MissingParameterError("ContactId not found in event")
 
         debug_log("Processing Connect event", {
             "contactId": contact_id,
-            "hasParameters": bool(event.get('Details', {}).get('Parameters'))
+            "hasParameters": bool(parameters)
         })
 
         # Extract required configuration parameters
-        ai_assistant_id = get_parameter_from_event_or_env(ContextKeys.AI_ASSISTANT_ID, event)
-        connect_instance_id = os.environ.get(ContextKeys.CONNECT_INSTANCE_ID)
+        ai_assistant_id = get_parameter_from_event_or_env(ContextKeys.AI_ASSISTANT_ID, parameters)
+        connect_instance_id = _CONNECT_INSTANCE_ID
 
         if not connect_instance_id:
-            raise Exception(f"Required parameter '{ContextKeys.CONNECT_INSTANCE_ID}' not found in Lambda environment variables.")
+            raise MissingParameterError(f"Required parameter '{ContextKeys.CONNECT_INSTANCE_ID}' not found in Lambda environment variables.")
 
         # Convert Connect parameters to Q Connect session data format
-        session_data = get_session_data(event)
+        session_data = get_session_data(parameters)
 
         # Check if we have any data to update
         if not session_data:
             debug_log("No session data to update - all parameters were system parameters")
             return {
                 'statusCode': 200,
-                'body': json.dumps({'message': 'No session data to update'})
+                'body': _NO_SESSION_DATA_BODY
             }
 
         # Get Q Connect session ARN from the Connect contact
@@ -263,14 +407,19 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         return {
             'statusCode': 200,
-            'body': json.dumps({
-                'message': f'Successfully updated {len(session_data)} session data entries'
-            })
+            'body': _SUCCESS_BODY_TEMPLATE % len(session_data)
+        }
+
+    except QicHandlerError as e:
+        logger.error(f"Error processing request: {e.code}: {e}")
+        return {
+            'statusCode': 500,
+            'body': _HANDLER_ERROR_BODY_TEMPLATE % (_dumps(str(e)), e.code)
         }
 
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+            'body': _ERROR_BODY_TEMPLATE % _dumps(str(e))
         }
\ No newline at end of file
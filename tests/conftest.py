@@ -0,0 +1,14 @@
+"""
+Shared pytest configuration for Amazon Connect Q Connect Session Data Updater tests.
+
+Author: Ankit Jain
+Version: 1.0.0
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+# Stub boto3 before any test imports index: every AWS client is mocked in the
+# tests, so the real package would only add import and client-construction cost.
+# botocore stays real, so ClientError and Config are the genuine classes.
+sys.modules['boto3'] = MagicMock()
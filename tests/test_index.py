@@ -5,453 +5,611 @@ Author: Ankit Jain
 Version: 1.0.0
 """
 
+import importlib
+import importlib.util
 import json
 import os
 import sys
-import unittest
-from unittest.mock import MagicMock, patch, Mock
-from typing import Dict, Any
+from dataclasses import dataclass
+from datetime import datetime
+from unittest.mock import MagicMock, Mock, create_autospec, patch
+from typing import Any, Dict, Optional
 
-import boto3
 from botocore.exceptions import ClientError
 import pytest
 
-# Add src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-try:
-    import index
-    from index import (
-        ContextKeys,
-        debug_log,
-        get_qic_session_arn,
-        get_parameter_from_event_or_env,
-        get_session_data,
-        update_qic_session,
-        lambda_handler
+# Add src directory to Python path, once per process
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+# Skip only when the module is absent; an ImportError raised while importing
+# index itself is a real test failure
+if importlib.util.find_spec('index') is None:
+    pytest.skip(f"Could not find index module in {_SRC}", allow_module_level=True)
+
+import index
+from index import (
+    ContextKeys,
+    debug_log,
+    get_qic_session_arn,
+    get_parameter_from_event_or_env,
+    get_session_data,
+    update_qic_session,
+    lambda_handler
+)
+
+# AWS API errors, built once; mocks only raise them
+_NOT_FOUND_ERR = ClientError(
+    {'Error': {'Code': 'ResourceNotFoundException', 'Message': 'Contact not found'}},
+    'DescribeContact'
+)
+_VALIDATION_ERR = ClientError(
+    {'Error': {'Code': 'ValidationException', 'Message': 'Invalid session data'}},
+    'UpdateSessionData'
+)
+
+
+class _ConnectClientSpec:
+    """The Amazon Connect client operations index calls."""
+
+    def describe_contact(self, *, ContactId: str, InstanceId: str) -> Dict[str, Any]:
+        ...
+
+
+class _QConnectClientSpec:
+    """The Q Connect client operations index calls."""
+
+    def update_session_data(self, *, assistantId: str, sessionId: str, data: Any) -> Dict[str, Any]:
+        ...
+
+
+@pytest.fixture(scope="module")
+def aws_client_mocks():
+    """Build autospec'd Amazon Connect and Q Connect clients once per module."""
+    return (
+        create_autospec(_ConnectClientSpec, instance=True),
+        create_autospec(_QConnectClientSpec, instance=True)
     )
-except ImportError as e:
-    pytest.skip(f"Could not import index module: {e}", allow_module_level=True)
 
 
-class TestContextKeys(unittest.TestCase):
-    """Test ContextKeys class constants."""
+@pytest.fixture(autouse=True)
+def aws_clients(aws_client_mocks, monkeypatch):
+    """Route index's client factories to the shared mocks, reset for each test."""
+    connect_client, qconnect_client = aws_client_mocks
+    connect_client.reset_mock(return_value=True, side_effect=True)
+    qconnect_client.reset_mock(return_value=True, side_effect=True)
+    # Re-pointed per test because some tests reload index, which restores the
+    # real factories
+    monkeypatch.setattr(index, '_get_connect', lambda: connect_client)
+    monkeypatch.setattr(index, '_get_qconnect', lambda: qconnect_client)
+    # Pin the TTL index resolved from CACHE_TTL_SECONDS at import
+    monkeypatch.setattr(index, '_SESSION_ARN_CACHE_TTL', index._DEFAULT_SESSION_ARN_CACHE_TTL)
+    index._SESSION_ARN_CACHE.clear()
+    return aws_client_mocks
+
+
+@pytest.fixture
+def mock_logger(monkeypatch):
+    """Replace index.logger with a MagicMock for the duration of a test."""
+    logger = MagicMock()
+    monkeypatch.setattr(index, 'logger', logger)
+    return logger
+
+
+@pytest.fixture
+def mock_debug_log(monkeypatch):
+    """Replace index.debug_log with a MagicMock for the duration of a test."""
+    debug_log_mock = MagicMock()
+    monkeypatch.setattr(index, 'debug_log', debug_log_mock)
+    return debug_log_mock
+
+
+@pytest.fixture
+def connect_instance_id(request, monkeypatch):
+    """Configure the Connect instance ID the handler resolved at import; a None parameter simulates it missing."""
+    instance_id = getattr(request, 'param', 'test-instance-id')
+    monkeypatch.setattr(index, '_CONNECT_INSTANCE_ID', instance_id)
+    yield instance_id
+
+
+@pytest.fixture
+def reload_index(monkeypatch):
+    """Re-import index on demand; it is re-imported under the original environment afterwards."""
+    yield lambda: importlib.reload(index)
+    monkeypatch.undo()
+    importlib.reload(index)
+
+
+@pytest.fixture
+def debug_env(request, monkeypatch, reload_index):
+    """Re-import index with DEBUG_LOG set from the parameter."""
+    monkeypatch.delenv('DEBUG_LOG', raising=False)
+    if request.param is not None:
+        monkeypatch.setenv('DEBUG_LOG', request.param)
+    reload_index()
+
+
+def test_context_keys_constants():
+    """Test that ContextKeys contains expected constants."""
+    assert ContextKeys.AI_ASSISTANT_ID == "AI_ASSISTANT_ID"
+    assert ContextKeys.CONNECT_INSTANCE_ID == "CONNECT_INSTANCE_ID"
+
+
+@pytest.mark.parametrize("debug_env, expect_call", [
+    ('true', True),
+    ('false', False),
+    (None, False),
+], indirect=["debug_env"], ids=["enabled", "disabled", "unset"])
+def test_debug_log(debug_env, mock_logger, expect_call):
+    """Test debug_log only logs when DEBUG_LOG is 'true' at import time."""
+    debug_log("Test message", {"key": "value"})
+
+    assert mock_logger.info.called is expect_call
+    if expect_call:
+        mock_logger.info.assert_called_once()
 
-    def test_context_keys_constants(self):
-        """Test that ContextKeys contains expected constants."""
-        self.assertEqual(ContextKeys.AI_ASSISTANT_ID, "AI_ASSISTANT_ID")
-        self.assertEqual(ContextKeys.CONNECT_INSTANCE_ID, "CONNECT_INSTANCE_ID")
+        # Check the logged message structure
+        parsed_log = json.loads(mock_logger.info.call_args[0][0])
+        assert parsed_log["level"] == "DEBUG"
+        assert parsed_log["message"] == "Test message"
+        assert parsed_log["params"] == {"key": "value"}
 
 
-class TestDebugLog(unittest.TestCase):
-    """Test debug_log function."""
+def test_debug_log_non_serializable_data(monkeypatch, mock_logger):
+    """Test debug_log stringifies values JSON cannot encode, such as datetimes."""
+    monkeypatch.setattr(index, '_DEBUG_ENABLED', True)
 
-    @patch.dict(os.environ, {'DEBUG_LOG': 'true'})
-    @patch('index.logger')
-    def test_debug_log_enabled(self, mock_logger):
-        """Test debug_log when DEBUG_LOG is enabled."""
-        debug_log("Test message", {"key": "value"})
-        
-        # Verify logger.info was called
-        mock_logger.info.assert_called_once()
-        
-        # Check the logged message structure
-        logged_message = mock_logger.info.call_args[0][0]
-        parsed_log = json.loads(logged_message)
-        
-        self.assertEqual(parsed_log["level"], "DEBUG")
-        self.assertEqual(parsed_log["message"], "Test message")
-        self.assertEqual(parsed_log["params"], {"key": "value"})
-
-    @patch.dict(os.environ, {'DEBUG_LOG': 'false'})
-    @patch('index.logger')
-    def test_debug_log_disabled(self, mock_logger):
-        """Test debug_log when DEBUG_LOG is disabled."""
-        debug_log("Test message", {"key": "value"})
-        
-        # Verify logger.info was not called
-        mock_logger.info.assert_not_called()
-
-    @patch.dict(os.environ, {}, clear=True)
-    @patch('index.logger')
-    def test_debug_log_no_env_var(self, mock_logger):
-        """Test debug_log when DEBUG_LOG environment variable is not set."""
-        debug_log("Test message")
-        
-        # Verify logger.info was not called
-        mock_logger.info.assert_not_called()
-
-
-class TestGetQicSessionArn(unittest.TestCase):
-    """Test get_qic_session_arn function."""
-
-    @patch('index.connect_client')
-    @patch('index.debug_log')
-    def test_get_qic_session_arn_success(self, mock_debug_log, mock_connect_client):
-        """Test successful retrieval of Q Connect session ARN."""
-        # Mock the API response
-        mock_response = {
-            'Contact': {
-                'WisdomInfo': {
-                    'SessionArn': 'arn:aws:qconnect:us-east-1:123456789012:session/test-session-arn'
-                }
-            }
-        }
-        mock_connect_client.describe_contact.return_value = mock_response
-
-        result = get_qic_session_arn("test-contact-id", "test-instance-id")
-
-        # Verify the result
-        self.assertEqual(result, 'arn:aws:qconnect:us-east-1:123456789012:session/test-session-arn')
-        
-        # Verify API was called correctly
-        mock_connect_client.describe_contact.assert_called_once_with(
-            ContactId="test-contact-id",
-            InstanceId="test-instance-id"
-        )
-        
-        # Verify debug logs were called
-        self.assertEqual(mock_debug_log.call_count, 2)
-
-    @patch('index.connect_client')
-    @patch('index.debug_log')
-    def test_get_qic_session_arn_no_session(self, mock_debug_log, mock_connect_client):
-        """Test when no Q Connect session is found."""
-        # Mock the API response without session
-        mock_response = {'Contact': {}}
-        mock_connect_client.describe_contact.return_value = mock_response
-
-        with self.assertRaises(Exception) as context:
-            get_qic_session_arn("test-contact-id", "test-instance-id")
-
-        self.assertIn("No Q Connect session found for contact test-contact-id", str(context.exception))
-
-    @patch('index.connect_client')
-    @patch('index.logger')
-    def test_get_qic_session_arn_client_error(self, mock_logger, mock_connect_client):
-        """Test handling of ClientError from AWS API."""
-        # Mock ClientError
-        error_response = {
-            'Error': {
-                'Code': 'ResourceNotFoundException',
-                'Message': 'Contact not found'
-            }
-        }
-        mock_connect_client.describe_contact.side_effect = ClientError(error_response, 'DescribeContact')
+    debug_log("Test message", {"timestamp": datetime(2024, 1, 1, 12, 0, 0)})
+
+    parsed_log = json.loads(mock_logger.info.call_args[0][0])
+    assert "2024-01-01" in parsed_log["params"]["timestamp"]
 
-        with self.assertRaises(ClientError):
-            get_qic_session_arn("test-contact-id", "test-instance-id")
 
-        # Verify error was logged
-        mock_logger.error.assert_called_once()
+@pytest.mark.parametrize("block_orjson", [False, True], ids=["orjson", "stdlib"])
+def test_dumps_handles_input_orjson_rejects(block_orjson, monkeypatch, reload_index):
+    """Test _dumps serializes lone surrogates and non-str keys with or without orjson."""
+    if block_orjson:
+        monkeypatch.setitem(sys.modules, 'orjson', None)
+        reload_index()
+        # The standard library encoder separates items with ", "
+        assert index._dumps({"key": "value"}) == '{"key": "value"}'
 
+    data = {"message": "bad \ud800", 1: datetime(2024, 1, 1)}
 
-class TestGetParameterFromEventOrEnv(unittest.TestCase):
-    """Test get_parameter_from_event_or_env function."""
+    assert json.loads(index._dumps(data)) == {"message": "bad \ud800", "1": "2024-01-01 00:00:00"}
 
-    @patch('index.debug_log')
-    def test_get_parameter_from_event(self, mock_debug_log):
-        """Test getting parameter from event parameters."""
-        event = {
-            'Details': {
-                'Parameters': {
-                    'AI_ASSISTANT_ID': 'event-assistant-id'
-                }
+
+def test_clients_built_at_import_in_lambda(monkeypatch, reload_index):
+    """Test that AWS clients are built at import time inside Lambda."""
+    monkeypatch.setenv('AWS_LAMBDA_FUNCTION_NAME', 'test-function')
+    with patch('boto3.client') as mock_client:
+        reload_index()
+
+    services = sorted(call.args[0] for call in mock_client.call_args_list)
+    assert services == ['connect', 'qconnect']
+
+
+def test_clients_not_built_at_import_outside_lambda(monkeypatch, reload_index):
+    """Test that importing outside Lambda does not build AWS clients."""
+    monkeypatch.delenv('AWS_LAMBDA_FUNCTION_NAME', raising=False)
+    with patch('boto3.client') as mock_client:
+        reload_index()
+
+    mock_client.assert_not_called()
+
+
+def test_get_qic_session_arn_success(aws_clients, mock_debug_log):
+    """Test successful retrieval of Q Connect session ARN."""
+    connect_client, _ = aws_clients
+    connect_client.describe_contact.return_value = {
+        'Contact': {
+            'WisdomInfo': {
+                'SessionArn': 'arn:aws:qconnect:us-east-1:123456789012:session/test-session-arn'
             }
         }
+    }
 
-        result = get_parameter_from_event_or_env('AI_ASSISTANT_ID', event)
+    result = get_qic_session_arn("test-contact-id", "test-instance-id")
 
-        self.assertEqual(result, 'event-assistant-id')
-        mock_debug_log.assert_called_once()
+    # Verify the result
+    assert result == 'arn:aws:qconnect:us-east-1:123456789012:session/test-session-arn'
 
-    @patch.dict(os.environ, {'AI_ASSISTANT_ID': 'env-assistant-id'})
-    @patch('index.debug_log')
-    def test_get_parameter_from_env(self, mock_debug_log):
-        """Test getting parameter from environment variables."""
-        event = {'Details': {'Parameters': {}}}
+    # Verify API was called correctly
+    connect_client.describe_contact.assert_called_once_with(
+        ContactId="test-contact-id",
+        InstanceId="test-instance-id"
+    )
 
-        result = get_parameter_from_event_or_env('AI_ASSISTANT_ID', event)
+    # Verify debug logs were called
+    assert mock_debug_log.call_count == 2
 
-        self.assertEqual(result, 'env-assistant-id')
-        mock_debug_log.assert_called_once()
 
-    def test_get_parameter_not_found(self):
-        """Test when parameter is not found in either location."""
-        event = {'Details': {'Parameters': {}}}
+def test_get_qic_session_arn_no_session(aws_clients, mock_debug_log):
+    """Test when no Q Connect session is found."""
+    connect_client, _ = aws_clients
+    connect_client.describe_contact.return_value = {'Contact': {}}
 
-        with self.assertRaises(Exception) as context:
-            get_parameter_from_event_or_env('MISSING_PARAM', event)
+    with pytest.raises(index.NoQConnectSessionError, match="No Q Connect session found for contact test-contact-id"):
+        get_qic_session_arn("test-contact-id", "test-instance-id")
 
-        self.assertIn("Required parameter 'MISSING_PARAM' not found", str(context.exception))
 
+@pytest.mark.parametrize("target,client_index,method,error,args", [
+    (get_qic_session_arn, 0, 'describe_contact', _NOT_FOUND_ERR,
+     ("test-contact-id", "test-instance-id")),
+    (update_qic_session, 1, 'update_session_data', _VALIDATION_ERR,
+     ("assistant-id", "session-arn", [{'key': 'test', 'value': {'stringValue': 'value'}}])),
+], ids=['get_qic_session_arn', 'update_qic_session'])
+def test_client_error_logged_and_raised(aws_clients, mock_logger, target, client_index, method, error, args):
+    """Test that a ClientError from the AWS API is logged and re-raised."""
+    getattr(aws_clients[client_index], method).side_effect = error
 
-class TestGetSessionData(unittest.TestCase):
-    """Test get_session_data function."""
+    with pytest.raises(ClientError):
+        target(*args)
 
-    @patch('index.debug_log')
-    def test_get_session_data_success(self, mock_debug_log):
-        """Test successful conversion of parameters to session data."""
-        event = {
-            'Details': {
-                'Parameters': {
-                    'AI_ASSISTANT_ID': 'assistant-id',  # Should be filtered out
-                    'CONNECT_INSTANCE_ID': 'instance-id',  # Should be filtered out
-                    'customer_intent': 'purchase',
-                    'customer_tier': 'gold',
-                    'product_id': '12345'
-                }
-            }
-        }
+    # Verify error was logged
+    mock_logger.error.assert_called_once()
 
-        result = get_session_data(event)
-
-        # Should have 3 session data entries (excluding system parameters)
-        self.assertEqual(len(result), 3)
-        
-        # Verify structure of session data entries
-        expected_keys = {'customer_intent', 'customer_tier', 'product_id'}
-        actual_keys = {entry['key'] for entry in result}
-        self.assertEqual(actual_keys, expected_keys)
-
-        # Verify data structure
-        for entry in result:
-            self.assertIn('key', entry)
-            self.assertIn('value', entry)
-            self.assertIn('stringValue', entry['value'])
-
-    @patch('index.debug_log')
-    def test_get_session_data_no_parameters(self, mock_debug_log):
-        """Test when no parameters are found in event."""
-        event = {'Details': {}}
-
-        result = get_session_data(event)
-
-        self.assertEqual(len(result), 0)
-        mock_debug_log.assert_called_once_with("No parameters found in Connect event")
-
-    @patch('index.debug_log')
-    def test_get_session_data_only_system_params(self, mock_debug_log):
-        """Test when only system parameters are present."""
-        event = {
-            'Details': {
-                'Parameters': {
-                    'AI_ASSISTANT_ID': 'assistant-id',
-                    'CONNECT_INSTANCE_ID': 'instance-id'
-                }
-            }
-        }
 
-        result = get_session_data(event)
+def test_get_qic_session_arn_cached(aws_clients, mock_debug_log):
+    """Test that repeated lookups for a contact reuse the cached ARN."""
+    connect_client, _ = aws_clients
+    connect_client.describe_contact.return_value = {
+        'Contact': {'WisdomInfo': {'SessionArn': 'cached-session-arn'}}
+    }
 
-        self.assertEqual(len(result), 0)
+    first = get_qic_session_arn("test-contact-id", "test-instance-id")
+    second = get_qic_session_arn("test-contact-id", "test-instance-id")
 
+    assert first == second == 'cached-session-arn'
+    connect_client.describe_contact.assert_called_once()
 
-class TestUpdateQicSession(unittest.TestCase):
-    """Test update_qic_session function."""
 
-    @patch('index.qconnect_client')
-    @patch('index.debug_log')
-    def test_update_qic_session_success(self, mock_debug_log, mock_qconnect_client):
-        """Test successful Q Connect session update."""
-        session_data = [
-            {
-                'key': 'customer_intent',
-                'value': {'stringValue': 'purchase'}
-            }
+def test_get_qic_session_arn_cache_disabled(aws_clients, mock_debug_log, monkeypatch):
+    """Test that a zero TTL disables session ARN caching."""
+    monkeypatch.setattr(index, '_SESSION_ARN_CACHE_TTL', 0)
+    connect_client, _ = aws_clients
+    connect_client.describe_contact.return_value = {
+        'Contact': {'WisdomInfo': {'SessionArn': 'uncached-session-arn'}}
+    }
+
+    get_qic_session_arn("test-contact-id", "test-instance-id")
+    get_qic_session_arn("test-contact-id", "test-instance-id")
+
+    assert connect_client.describe_contact.call_count == 2
+
+
+def test_get_qic_session_arn_cache_expired(aws_clients, mock_debug_log, monkeypatch):
+    """Test that an expired cache entry is dropped and the ARN resolved again."""
+    now = [1000.0]
+    monkeypatch.setattr(index.time, 'monotonic', lambda: now[0])
+    connect_client, _ = aws_clients
+    connect_client.describe_contact.return_value = {
+        'Contact': {'WisdomInfo': {'SessionArn': 'expiring-session-arn'}}
+    }
+
+    get_qic_session_arn("test-contact-id", "test-instance-id")
+    now[0] += index._SESSION_ARN_CACHE_TTL + 1
+    result = get_qic_session_arn("test-contact-id", "test-instance-id")
+
+    assert result == 'expiring-session-arn'
+    assert connect_client.describe_contact.call_count == 2
+    assert index._SESSION_ARN_CACHE[("test-contact-id", "test-instance-id")][1] > now[0]
+
+
+def test_get_qic_session_arn_cache_evicts_oldest(aws_clients, mock_debug_log, monkeypatch):
+    """Test that a full cache evicts its oldest entry to make room."""
+    monkeypatch.setattr(index, '_SESSION_ARN_CACHE_MAX_SIZE', 2)
+    connect_client, _ = aws_clients
+    connect_client.describe_contact.return_value = {
+        'Contact': {'WisdomInfo': {'SessionArn': 'test-session-arn'}}
+    }
+
+    for contact_id in ("contact-1", "contact-2", "contact-3"):
+        get_qic_session_arn(contact_id, "test-instance-id")
+
+    assert list(index._SESSION_ARN_CACHE) == [
+        ("contact-2", "test-instance-id"),
+        ("contact-3", "test-instance-id")
+    ]
+
+
+def test_invalid_cache_ttl_falls_back_to_default(monkeypatch, reload_index, caplog):
+    """Test that a malformed CACHE_TTL_SECONDS logs a warning instead of failing import."""
+    monkeypatch.setenv('CACHE_TTL_SECONDS', 'five minutes')
+
+    reload_index()
+
+    assert index._SESSION_ARN_CACHE_TTL == index._DEFAULT_SESSION_ARN_CACHE_TTL
+    assert "CACHE_TTL_SECONDS" in caplog.text
+
+
+@pytest.mark.parametrize("parameters, env, expected, error", [
+    ({'AI_ASSISTANT_ID': 'event-assistant-id'}, {}, 'event-assistant-id', None),
+    ({}, {'AI_ASSISTANT_ID': 'env-assistant-id'}, 'env-assistant-id', None),
+    ({}, {}, None, "Required parameter 'AI_ASSISTANT_ID' not found"),
+], ids=["from_event", "from_env", "not_found"])
+def test_get_parameter_from_event_or_env(parameters, env, expected, error, monkeypatch, mock_debug_log):
+    """Test parameter lookup from event parameters with environment fallback."""
+    monkeypatch.delenv('AI_ASSISTANT_ID', raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+
+    if error:
+        with pytest.raises(index.MissingParameterError, match=error):
+            get_parameter_from_event_or_env('AI_ASSISTANT_ID', parameters)
+        mock_debug_log.assert_not_called()
+    else:
+        assert get_parameter_from_event_or_env('AI_ASSISTANT_ID', parameters) == expected
+        mock_debug_log.assert_called_once()
+
+
+@pytest.mark.parametrize("parameters, expected", [
+    (
+        {
+            'AI_ASSISTANT_ID': 'assistant-id',  # Should be filtered out
+            'CONNECT_INSTANCE_ID': 'instance-id',  # Should be filtered out
+            'customer_intent': 'purchase',
+            'customer_tier': 'gold',
+            'product_id': '12345'
+        },
+        [
+            {'key': 'customer_intent', 'value': {'stringValue': 'purchase'}},
+            {'key': 'customer_tier', 'value': {'stringValue': 'gold'}},
+            {'key': 'product_id', 'value': {'stringValue': '12345'}}
         ]
-        
-        mock_response = {'ResponseMetadata': {'HTTPStatusCode': 200}}
-        mock_qconnect_client.update_session_data.return_value = mock_response
-
-        # Should not raise an exception
-        update_qic_session("assistant-id", "session-arn", session_data)
-
-        # Verify API was called correctly
-        mock_qconnect_client.update_session_data.assert_called_once_with(
-            assistantId="assistant-id",
-            sessionId="session-arn",
-            data=session_data
-        )
-
-        # Verify debug logs were called
-        self.assertEqual(mock_debug_log.call_count, 2)
-
-    @patch('index.qconnect_client')
-    @patch('index.logger')
-    def test_update_qic_session_client_error(self, mock_logger, mock_qconnect_client):
-        """Test handling of ClientError from Q Connect API."""
-        session_data = [{'key': 'test', 'value': {'stringValue': 'value'}}]
-        
-        error_response = {
-            'Error': {
-                'Code': 'ValidationException',
-                'Message': 'Invalid session data'
-            }
-        }
-        mock_qconnect_client.update_session_data.side_effect = ClientError(error_response, 'UpdateSessionData')
-
-        with self.assertRaises(ClientError):
-            update_qic_session("assistant-id", "session-arn", session_data)
-
-        # Verify error was logged
-        mock_logger.error.assert_called_once()
-
-
-class TestLambdaHandler(unittest.TestCase):
-    """Test lambda_handler function."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.valid_event = {
-            'Details': {
-                'ContactData': {
-                    'ContactId': 'test-contact-id'
-                },
-                'Parameters': {
-                    'AI_ASSISTANT_ID': 'test-assistant-id',
-                    'customer_intent': 'purchase',
-                    'product_id': '12345'
-                }
-            }
+    ),
+    ({}, []),
+    ({'AI_ASSISTANT_ID': 'assistant-id', 'CONNECT_INSTANCE_ID': 'instance-id'}, []),
+    (
+        {'previous_interaction_count': 3, 'customer_note': None},
+        [
+            {'key': 'previous_interaction_count', 'value': {'stringValue': '3'}},
+            {'key': 'customer_note', 'value': {'stringValue': ''}}
+        ]
+    ),
+], ids=["success", "no_parameters", "only_system_params", "converts_values"])
+def test_get_session_data(parameters, expected, mock_debug_log):
+    """Test conversion of Connect parameters to Q Connect session data."""
+    assert get_session_data(parameters) == expected
+
+
+def test_get_session_data_no_parameters_logged(mock_debug_log):
+    """Test that an event without parameters is logged."""
+    get_session_data({})
+
+    mock_debug_log.assert_called_once_with("No parameters found in Connect event")
+
+
+def test_get_session_data_single_debug_log(monkeypatch, mock_debug_log):
+    """Test that conversion emits one aggregate debug log listing the keys."""
+    monkeypatch.setattr(index, '_DEBUG_ENABLED', True)
+    parameters = {
+        'AI_ASSISTANT_ID': 'assistant-id',
+        'customer_intent': 'purchase',
+        'customer_tier': 'gold'
+    }
+
+    get_session_data(parameters)
+
+    mock_debug_log.assert_called_once()
+    logged_data = mock_debug_log.call_args[0][1]
+    assert logged_data['keys'] == ['customer_intent', 'customer_tier']
+    assert logged_data['systemParameters'] == 1
+
+
+def test_update_qic_session_success(aws_clients, mock_debug_log):
+    """Test successful Q Connect session update."""
+    _, qconnect_client = aws_clients
+    session_data = [
+        {
+            'key': 'customer_intent',
+            'value': {'stringValue': 'purchase'}
         }
-        self.context = Mock()
+    ]
+    qconnect_client.update_session_data.return_value = {'ResponseMetadata': {'HTTPStatusCode': 200}}
 
-    @patch.dict(os.environ, {'CONNECT_INSTANCE_ID': 'test-instance-id'})
-    @patch('index.update_qic_session')
-    @patch('index.get_qic_session_arn')
-    @patch('index.debug_log')
-    def test_lambda_handler_success(self, mock_debug_log, mock_get_session_arn, mock_update_session):
-        """Test successful lambda execution."""
-        mock_get_session_arn.return_value = 'test-session-arn'
+    # Should not raise an exception
+    update_qic_session("assistant-id", "session-arn", session_data)
+
+    # Verify API was called correctly
+    qconnect_client.update_session_data.assert_called_once_with(
+        assistantId="assistant-id",
+        sessionId="session-arn",
+        data=session_data
+    )
 
-        result = lambda_handler(self.valid_event, self.context)
+    # Verify debug logs were called
+    assert mock_debug_log.call_count == 2
 
-        # Verify successful response
-        self.assertEqual(result['statusCode'], 200)
-        body = json.loads(result['body'])
-        self.assertIn('Successfully updated', body['message'])
 
-        # Verify functions were called
+# Handler event template; tests only read it, variants are built by _event_with
+_BASE_EVENT = {
+    'Details': {
+        'ContactData': {
+            'ContactId': 'test-contact-id'
+        },
+        'Parameters': {
+            'AI_ASSISTANT_ID': 'test-assistant-id',
+            'customer_intent': 'purchase',
+            'product_id': '12345'
+        }
+    }
+}
+
+CONTEXT = Mock()
+
+
+def _body(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the parsed JSON body of a lambda_handler response."""
+    return json.loads(result['body'])
+
+
+def assert_body_contains(result: Dict[str, Any], status: int, field: str, substr: str) -> Dict[str, Any]:
+    """Assert the response status, then that body[field] contains substr; return the body."""
+    assert result['statusCode'] == status
+    body = _body(result)
+    assert substr in body[field]
+    return body
+
+
+def _event_with(**details: Any) -> Dict[str, Any]:
+    """Return _BASE_EVENT with the given Details entries replaced (shallow merge)."""
+    return {**_BASE_EVENT, 'Details': {**_BASE_EVENT['Details'], **details}}
+
+
+@dataclass
+class HandlerCase:
+    """A lambda_handler scenario and the response it should produce."""
+    id: str
+    expected_status: int
+    expected_field: str
+    expected_text: str
+    exact: bool = False
+    expected_code: Optional[str] = None
+    event: Optional[Dict[str, Any]] = None
+    connect_instance_id: Optional[str] = 'test-instance-id'
+    session_arn_error: Optional[Exception] = None
+    expect_update: bool = False
+
+
+HANDLER_CASES = [
+    HandlerCase(
+        id="success",
+        expected_status=200,
+        expected_field='message',
+        expected_text='Successfully updated 2 session data entries',
+        expect_update=True
+    ),
+    HandlerCase(
+        id="missing_contact_id",
+        expected_status=500,
+        expected_field='error',
+        expected_text='ContactId not found in event',
+        expected_code='MissingParameter',
+        event=_event_with(ContactData={})
+    ),
+    HandlerCase(
+        id="no_session_data",
+        expected_status=200,
+        expected_field='message',
+        expected_text='No session data to update',
+        exact=True,
+        # Only system parameters
+        event=_event_with(Parameters={'AI_ASSISTANT_ID': 'test-assistant-id'})
+    ),
+    HandlerCase(
+        id="missing_env_var",
+        expected_status=500,
+        expected_field='error',
+        expected_text='CONNECT_INSTANCE_ID',
+        expected_code='MissingParameter',
+        connect_instance_id=None
+    ),
+    HandlerCase(
+        id="exception_handling",
+        expected_status=500,
+        expected_field='error',
+        expected_text='Test error',
+        exact=True,
+        session_arn_error=Exception("Test error")
+    ),
+    HandlerCase(
+        id="error_body_escaping",
+        expected_status=500,
+        expected_field='error',
+        expected_text='Bad "value" \\ here',
+        exact=True,
+        session_arn_error=Exception('Bad "value" \\ here')
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "case, connect_instance_id",
+    [(case, case.connect_instance_id) for case in HANDLER_CASES],
+    indirect=["connect_instance_id"],
+    ids=[case.id for case in HANDLER_CASES]
+)
+def test_lambda_handler(case, connect_instance_id, monkeypatch, mock_debug_log):
+    """Test lambda_handler responses across success and failure scenarios."""
+    mock_get_session_arn = MagicMock(return_value='test-session-arn', side_effect=case.session_arn_error)
+    mock_update_session = MagicMock()
+    monkeypatch.setattr(index, 'get_qic_session_arn', mock_get_session_arn)
+    monkeypatch.setattr(index, 'update_qic_session', mock_update_session)
+
+    result = lambda_handler(case.event or _BASE_EVENT, CONTEXT)
+
+    if case.exact:
+        assert result['statusCode'] == case.expected_status
+        body = _body(result)
+        assert body[case.expected_field] == case.expected_text
+    else:
+        body = assert_body_contains(result, case.expected_status, case.expected_field, case.expected_text)
+    assert body.get('code') == case.expected_code
+
+    if case.expect_update:
         mock_get_session_arn.assert_called_once_with('test-contact-id', 'test-instance-id')
         mock_update_session.assert_called_once()
 
-    def test_lambda_handler_missing_contact_id(self):
-        """Test lambda handler with missing contact ID."""
-        invalid_event = {'Details': {'ContactData': {}}}
-
-        result = lambda_handler(invalid_event, self.context)
-
-        # Verify error response
-        self.assertEqual(result['statusCode'], 500)
-        body = json.loads(result['body'])
-        self.assertIn('ContactId not found in event', body['error'])
-
-    @patch('index.debug_log')
-    def test_lambda_handler_no_session_data(self, mock_debug_log):
-        """Test lambda handler when no session data is available."""
-        event_no_params = {
-            'Details': {
-                'ContactData': {'ContactId': 'test-contact-id'},
-                'Parameters': {
-                    'AI_ASSISTANT_ID': 'test-assistant-id'  # Only system parameters
-                }
-            }
-        }
 
-        with patch.dict(os.environ, {'CONNECT_INSTANCE_ID': 'test-instance-id'}):
-            result = lambda_handler(event_no_params, self.context)
-
-        # Verify successful response with no data to update
-        self.assertEqual(result['statusCode'], 200)
-        body = json.loads(result['body'])
-        self.assertEqual(body['message'], 'No session data to update')
-
-    @patch.dict(os.environ, {}, clear=True)
-    def test_lambda_handler_missing_env_var(self):
-        """Test lambda handler with missing environment variable."""
-        result = lambda_handler(self.valid_event, self.context)
-
-        # Verify error response
-        self.assertEqual(result['statusCode'], 500)
-        body = json.loads(result['body'])
-        self.assertIn('CONNECT_INSTANCE_ID', body['error'])
-
-    @patch.dict(os.environ, {'CONNECT_INSTANCE_ID': 'test-instance-id'})
-    @patch('index.get_qic_session_arn')
-    @patch('index.debug_log')
-    def test_lambda_handler_exception_handling(self, mock_debug_log, mock_get_session_arn):
-        """Test lambda handler exception handling."""
-        mock_get_session_arn.side_effect = Exception("Test error")
-
-        result = lambda_handler(self.valid_event, self.context)
-
-        # Verify error response
-        self.assertEqual(result['statusCode'], 500)
-        body = json.loads(result['body'])
-        self.assertEqual(body['error'], 'Test error')
-
-
-class TestIntegration(unittest.TestCase):
-    """Integration tests for the full workflow."""
-
-    @patch.dict(os.environ, {'CONNECT_INSTANCE_ID': 'test-instance-id'})
-    @patch('index.qconnect_client')
-    @patch('index.connect_client')
-    @patch('index.debug_log')
-    def test_full_workflow_success(self, mock_debug_log, mock_connect_client, mock_qconnect_client):
-        """Test the complete workflow from event to Q Connect update."""
-        # Mock Connect API response
-        mock_connect_response = {
-            'Contact': {
-                'WisdomInfo': {
-                    'SessionArn': 'test-session-arn'
-                }
+@pytest.mark.usefixtures("connect_instance_id")
+def test_lambda_handler_error_body_lone_surrogate(monkeypatch, mock_logger, mock_debug_log):
+    """Test that an error message orjson cannot encode still produces a 500 body."""
+    # mock_logger keeps the surrogate out of captured logs, which xdist cannot transmit
+    monkeypatch.setattr(index, 'get_qic_session_arn', MagicMock(side_effect=Exception('bad \ud800')))
+
+    result = lambda_handler(_BASE_EVENT, CONTEXT)
+
+    assert result['statusCode'] == 500
+    assert _body(result) == {'error': 'bad \ud800'}
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures("connect_instance_id")
+def test_full_workflow_success(aws_clients, mock_debug_log):
+    """Test the complete workflow from event to Q Connect update."""
+    connect_client, qconnect_client = aws_clients
+
+    # Mock Connect API response
+    connect_client.describe_contact.return_value = {
+        'Contact': {
+            'WisdomInfo': {
+                'SessionArn': 'test-session-arn'
             }
         }
-        mock_connect_client.describe_contact.return_value = mock_connect_response
-
-        # Mock Q Connect API response
-        mock_qconnect_response = {'ResponseMetadata': {'HTTPStatusCode': 200}}
-        mock_qconnect_client.update_session_data.return_value = mock_qconnect_response
-
-        # Test event with multiple parameters
-        event = {
-            'Details': {
-                'ContactData': {
-                    'ContactId': 'integration-test-contact-id'
-                },
-                'Parameters': {
-                    'AI_ASSISTANT_ID': 'integration-test-assistant-id',
-                    'customer_intent': 'support',
-                    'customer_tier': 'premium',
-                    'issue_category': 'billing',
-                    'priority': 'high'
-                }
-            }
+    }
+
+    # Mock Q Connect API response
+    qconnect_client.update_session_data.return_value = {'ResponseMetadata': {'HTTPStatusCode': 200}}
+
+    # Test event with multiple parameters
+    event = _event_with(
+        ContactData={'ContactId': 'integration-test-contact-id'},
+        Parameters={
+            'AI_ASSISTANT_ID': 'integration-test-assistant-id',
+            'customer_intent': 'support',
+            'customer_tier': 'premium',
+            'issue_category': 'billing',
+            'priority': 'high'
         }
+    )
 
-        result = lambda_handler(event, Mock())
-
-        # Verify successful response
-        self.assertEqual(result['statusCode'], 200)
-        body = json.loads(result['body'])
-        self.assertIn('Successfully updated 4 session data entries', body['message'])
+    result = lambda_handler(event, CONTEXT)
 
-        # Verify Connect API was called
-        mock_connect_client.describe_contact.assert_called_once_with(
-            ContactId='integration-test-contact-id',
-            InstanceId='test-instance-id'
-        )
+    # Verify successful response
+    assert_body_contains(result, 200, 'message', 'Successfully updated 4 session data entries')
 
-        # Verify Q Connect API was called with correct data
-        mock_qconnect_client.update_session_data.assert_called_once()
-        call_args = mock_qconnect_client.update_session_data.call_args
-        
-        self.assertEqual(call_args.kwargs['assistantId'], 'integration-test-assistant-id')
-        self.assertEqual(call_args.kwargs['sessionId'], 'test-session-arn')
-        self.assertEqual(len(call_args.kwargs['data']), 4)  # 4 non-system parameters
+    # Verify Connect API was called
+    connect_client.describe_contact.assert_called_once_with(
+        ContactId='integration-test-contact-id',
+        InstanceId='test-instance-id'
+    )
 
+    # Verify Q Connect API was called with correct data
+    qconnect_client.update_session_data.assert_called_once()
+    call_args = qconnect_client.update_session_data.call_args
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    assert call_args.kwargs['assistantId'] == 'integration-test-assistant-id'
+    assert call_args.kwargs['sessionId'] == 'test-session-arn'
+    assert len(call_args.kwargs['data']) == 4  # 4 non-system parameters